@@ -4,18 +4,35 @@ Implements: validators, pipeline, tracker (SQLite), error logger, CLI and sample
 This is a single-file runnable prototype you can split into modules later.
 """
 
-import re
+import array
 import csv
 import sqlite3
 import hashlib
+import io
+import locale
+import mmap
 import uuid
 import json
 from datetime import datetime, timezone
 from pathlib import Path
 import argparse
+import atexit
+import errno
+import multiprocessing
+import os
 import shutil
 import sys
 
+try:
+    import numpy as np
+except ImportError:  # optional: vectorised reading range check
+    np = None
+
+try:
+    import orjson
+except ImportError:  # optional: faster error-log encoding
+    orjson = None
+
 # ----------------------------- Configuration -----------------------------
 INCOMING = Path("data/incoming")
 ARCHIVE = Path("data/archive")
@@ -24,41 +41,72 @@ LOGS = Path("logs/errors.jsonl")
 DB_PATH = Path("app/seen.db")
 
 EXPECTED_HEADERS = ["batch_id", "timestamp"] + [f"reading{i}" for i in range(1, 11)]
-FILENAME_RX = re.compile(r"^MED_DATA_(\d{14})\.csv$")
-TIMESTAMP_RX = re.compile(r"^\d{2}:\d{2}:\d{2}$")
+READING_COLS = EXPECTED_HEADERS[2:]
+# what open() without an explicit encoding would decode CSVs with
+CSV_ENCODING = locale.getpreferredencoding(False)
+FILENAME_PREFIX = "MED_DATA_"
+FILENAME_SUFFIX = ".csv"
+FILENAME_TS_DIGITS = 14  # YYYYMMDDhhmmss
 
 # ensure dirs
 for p in (INCOMING, ARCHIVE, REJECTED, LOGS.parent, DB_PATH.parent):
     p.mkdir(parents=True, exist_ok=True)
 
 # ----------------------------- Error Logger -----------------------------
+def _json_default(o):
+    # same output orjson gives natively for the datetimes we log
+    if isinstance(o, datetime):
+        return o.isoformat()
+    # raw sha256 digests (see Tracker) are logged as hex
+    if isinstance(o, bytes):
+        return o.hex()
+    raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
+
+def _dumps(rec) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rec, default=_json_default)
+    return json.dumps(rec, ensure_ascii=False, default=_json_default).encode('utf-8')
+
 class ErrorLogger:
     def __init__(self, path=LOGS):
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        # opened on first emit (runs without errors leave no log) and kept open
+        self._fp = None
+        atexit.register(self.close)
 
     def _sha256(self, file_path):
         if not file_path:
             return None
-        h = hashlib.sha256()
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(1 << 20), b''):
-                h.update(chunk)
-        return h.hexdigest()
+            return hashlib.file_digest(f, 'sha256').hexdigest()
 
-    def emit(self, filename, rule, message, row=None, path=None, meta=None, guid=None):
+    def emit(self, filename, rule, message, row=None, path=None, meta=None, guid=None, sha=None):
+        # pass sha when it is already known; hashing path is a full file read per call
+        if isinstance(sha, bytes):
+            sha = sha.hex()
         rec = {
-            "guid": guid or str(uuid.uuid1()),
+            "guid": guid or str(uuid.uuid4()),
             "filename": filename,
-            "sha256": self._sha256(path) if path else None,
+            "sha256": sha or (self._sha256(path) if path else None),
             "rule": rule,
             "message": message,
             "row": row,
-            "occurred_at": datetime.now(timezone.utc).isoformat(),
+            "occurred_at": datetime.now(timezone.utc),
             "meta": meta or {}
         }
-        with open(self.path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        if self._fp is None:
+            self._fp = open(self.path, 'ab', buffering=1 << 16)
+        self._fp.write(_dumps(rec) + b"\n")
+
+    def flush(self):
+        if self._fp is not None:
+            self._fp.flush()
+
+    def close(self):
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
 
 logger = ErrorLogger()
 
@@ -68,34 +116,57 @@ class Tracker:
     CREATE TABLE IF NOT EXISTS seen_files (
       id INTEGER PRIMARY KEY,
       filename TEXT,
-      sha256 TEXT UNIQUE,
+      sha256 BLOB(32) UNIQUE NOT NULL,
       first_seen_ts TEXT
     );
     """
+    INSERT_SEEN = "INSERT OR IGNORE INTO seen_files(filename, sha256, first_seen_ts) VALUES (?, ?, ?)"
 
     def __init__(self, db_path=DB_PATH):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = sqlite3.connect(str(self.db_path))
+        # WAL + NORMAL sync: commits no longer fsync the main db file each time
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self.conn.execute(self.SCHEMA)
         self.conn.commit()
+        self._migrate_hex()
+        # in-memory mirror of the sha256 column so lookups skip SQLite
+        self._seen = {row[0] for row in self.conn.execute("SELECT sha256 FROM seen_files")}
+        # rows queued by mark_seen, written by flush(); also on interpreter exit so
+        # callers using Pipeline.process_file directly don't lose accepted files
+        self._pending = []
+        atexit.register(self.flush)
+
+    def _migrate_hex(self):
+        # databases from before sha256 was stored as a raw 32-byte digest hold hex text
+        rows = self.conn.execute("SELECT id, sha256 FROM seen_files WHERE typeof(sha256) = 'text'").fetchall()
+        if rows:
+            self.conn.executemany("UPDATE OR IGNORE seen_files SET sha256=? WHERE id=?",
+                                  [(bytes.fromhex(sha), rowid) for rowid, sha in rows])
+            self.conn.commit()
 
     def hash_file(self, path: Path):
-        h = hashlib.sha256()
+        # file_digest hands the file to OpenSSL in one go instead of a Python read loop
         with open(path, 'rb') as f:
-            for chunk in iter(lambda: f.read(1 << 20), b''):
-                h.update(chunk)
-        return h.hexdigest()
-
-    def is_seen(self, sha: str):
-        cur = self.conn.execute("SELECT 1 FROM seen_files WHERE sha256=?", (sha,))
-        return cur.fetchone() is not None
-
-    def mark_seen(self, filename: str, sha: str):
-        self.conn.execute(
-            "INSERT OR IGNORE INTO seen_files(filename, sha256, first_seen_ts) VALUES (?, ?, datetime('now'))",
-            (filename, sha)
-        )
+            return hashlib.file_digest(f, 'sha256').digest()
+
+    def is_seen(self, sha: bytes):
+        return sha in self._seen
+
+    def mark_seen(self, filename: str, sha: bytes):
+        # same UTC format as SQLite's datetime('now'), taken when the file is accepted
+        ts = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        self._pending.append((filename, sha, ts))
+        self._seen.add(sha)
+
+    def flush(self):
+        """Write pending mark_seen rows through one prepared INSERT and commit;
+        called once per batch."""
+        if self._pending:
+            self.conn.executemany(self.INSERT_SEEN, self._pending)
+            self._pending.clear()
         self.conn.commit()
 
 tracker = Tracker()
@@ -112,13 +183,22 @@ class BaseValidator:
     def validate(self, filename: str, path: Path, context=None) -> ValidationResult:
         raise NotImplementedError
 
+def filename_ts(filename):
+    r"""Return the 14-digit timestamp of a MED_DATA_<YYYYMMDDhhmmss>.csv name, else None.
+    Plain string checks in place of ^MED_DATA_(\d{14})\.csv$; isdecimal matches \d."""
+    start = len(FILENAME_PREFIX)
+    end = start + FILENAME_TS_DIGITS
+    if (len(filename) == end + len(FILENAME_SUFFIX) and filename.startswith(FILENAME_PREFIX)
+            and filename.endswith(FILENAME_SUFFIX) and filename[start:end].isdecimal()):
+        return filename[start:end]
+    return None
+
 class FilenameValidator(BaseValidator):
     name = "filename_format"
     def validate(self, filename, path, context=None):
-        m = FILENAME_RX.match(filename)
-        if not m:
+        ts = filename_ts(filename)
+        if ts is None:
             return ValidationResult(False, [{"rule": self.name, "message": "invalid filename format"}], {})
-        ts = m.group(1)
         try:
             dt = datetime.strptime(ts, "%Y%m%d%H%M%S")
         except ValueError:
@@ -132,90 +212,168 @@ class NonEmptyValidator(BaseValidator):
             return ValidationResult(False, [{"rule": self.name, "message": "file is empty"}], {})
         return ValidationResult(True, [], {})
 
-class CSVParseValidator(BaseValidator):
-    name = "csv_parse"
-    def validate(self, filename, path, context=None):
+# Importing numba and compiling the kernel costs ~0.8s on first use, more than
+# NumPy needs to compare far larger buffers, so smaller files never touch numba.
+NUMBA_MIN_ROWS = 1_000_000
+_check_readings = None  # compiled kernel; False once numba is known to be missing
+
+def _range_kernel(buf):
+    """Boolean mask of readings >= 10.0; compiled by Numba in _readings_kernel.
+    Walks the array in memory order (one reading column after another)."""
+    out = np.empty(buf.shape, dtype=np.bool_)
+    for c in range(buf.shape[0]):
+        for r in range(buf.shape[1]):
+            out[c, r] = buf[c, r] >= 10.0
+    return out
+
+def _readings_kernel():
+    """Return the compiled _range_kernel, building it on first call, or None
+    when numba is not installed."""
+    global _check_readings
+    if _check_readings is None:
         try:
-            with open(path, newline='') as f:
-                sn = f.read(4096)
-                f.seek(0)
-                reader = csv.reader(f)
-                for _ in range(2):
-                    next(reader, None)
-        except Exception as e:
-            return ValidationResult(False, [{"rule": self.name, "message": f"CSV parse error: {e}"}], {})
-        return ValidationResult(True, [], {})
-
-class HeaderValidator(BaseValidator):
-    name = "header_check"
+            from numba import njit
+        except ImportError:  # optional: compiled reading range check
+            _check_readings = False
+        else:
+            # No fastmath: it lets LLVM assume no NaNs, and NaN marks unparsed
+            # cells. cache=True keeps the machine code on disk across runs.
+            _check_readings = njit("boolean[:, :](float64[:, :])", cache=True)(_range_kernel)
+    return _check_readings or None
+
+def _out_of_range(values):
+    """Return (row, col, value) for every reading >= 10.0, in no particular order.
+
+    values is an array('d') of the parsed readings, row-major, len(READING_COLS)
+    per row, with NaN in place of cells that did not parse. They are regrouped into one
+    contiguous run per reading column and each column is scanned sequentially,
+    with NumPy when it is installed, and in the Numba kernel for buffers of at
+    least NUMBA_MIN_ROWS rows when numba is too."""
+    n = len(READING_COLS)
+    if np is not None:
+        cols = np.ascontiguousarray(np.frombuffer(values, dtype=np.float64).reshape(-1, n).T)
+        kernel = _readings_kernel() if cols.shape[1] >= NUMBA_MIN_ROWS else None
+        mask = kernel(cols) if kernel is not None else cols >= 10.0
+        cs, rs = np.nonzero(mask)
+        return [(int(r), int(c), float(cols[c, r])) for c, r in zip(cs, rs)]
+    out = []
+    for c in range(n):
+        out.extend((r, c, v) for r, v in enumerate(values[c::n]) if v >= 10.0)
+    return out
+
+def _iter_lines(text):
+    """Yield the lines of text one at a time, without their \n or \r\n ending."""
+    find = text.find
+    start = 0
+    end = find('\n')
+    while end >= 0:
+        line = text[start:end]
+        yield line[:-1] if line.endswith('\r') else line
+        start = end + 1
+        end = find('\n', start)
+    if start < len(text):
+        yield text[start:]
+
+class RowScanValidator(BaseValidator):
+    """One pass over the CSV covering the csv_parse, header_check, row_shape,
+    value_domain and duplicate_batch_id rules. Only the issues of the first
+    failing rule are reported, in that order, as when they ran separately.
+    The file is mapped once and the same bytes feed the SHA-256 used by the
+    uniqueness check, so it is only read from disk a single time. The decoded
+    text is held in memory and rows are produced from it lazily: lines without
+    quotes, NULs or bare CRs are split on commas directly, anything else goes
+    through the csv module."""
+    name = "row_scan"
     def validate(self, filename, path, context=None):
-        with open(path, newline='') as f:
-            reader = csv.reader(f)
+        ncols = len(EXPECTED_HEADERS)
+        ncols_r = len(READING_COLS)
+        shape_issues = []
+        # (row, slot, issue) so range issues found after the loop sort back into row order
+        domain_issues = []
+        # typed doubles, 8 bytes per reading instead of a boxed float per list slot
+        values = array.array('d')
+        dup_issues = []
+        seen = set()
+        # hoist lookups out of the per-row loop
+        _int = int
+        _float = float
+        _strip = str.strip
+        add_domain = domain_issues.append
+        add_values = values.extend
+        nan = float('nan')
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap refuses empty files; this is what reading the header reports
+                meta = {"sha": hashlib.sha256().digest()}
+                return ValidationResult(False, [{"rule": "header_check", "message": "missing header"}], meta)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sha = hashlib.sha256(mm).digest()
+                meta = {"sha": sha}
+                try:
+                    text = str(mm, CSV_ENCODING)
+                except UnicodeDecodeError as e:
+                    return ValidationResult(False, [{"rule": "csv_parse", "message": f"CSV parse error: {e}"}], meta)
+        fast = '"' not in text and '\0' not in text
+        if fast and '\r' in text:
+            # only CRLF endings; a bare CR is a row break to csv
+            fast = text.count('\r') == text.count('\r\n')
+        if fast:
+            # same rows csv.reader would give for unquoted input, blank line -> []
+            reader = (line.split(',') if line else [] for line in _iter_lines(text))
+        else:
+            reader = csv.reader(io.StringIO(text, newline=''))
+        try:
             try:
                 header = next(reader)
             except StopIteration:
-                return ValidationResult(False, [{"rule": self.name, "message": "missing header"}], {})
-        if header != EXPECTED_HEADERS:
-            return ValidationResult(False, [{"rule": self.name, "message": f"header mismatch: {header}"}], {})
-        return ValidationResult(True, [], {})
-
-class RowShapeValidator(BaseValidator):
-    name = "row_shape"
-    def validate(self, filename, path, context=None):
-        issues = []
-        with open(path, newline='') as f:
-            reader = csv.reader(f)
-            next(reader, None)
-            for i, row in enumerate(reader, start=2):
-                if len(row) != len(EXPECTED_HEADERS):
-                    issues.append({"rule": self.name, "message": f"row has {len(row)} cols", "row": i})
-        return ValidationResult(len(issues) == 0, issues, {})
-
-class ValueDomainValidator(BaseValidator):
-    name = "value_domain"
-    def validate(self, filename, path, context=None):
-        issues = []
-        with open(path, newline='') as f:
-            reader = csv.DictReader(f)
+                return ValidationResult(False, [{"rule": "header_check", "message": "missing header"}], meta)
+            if header != EXPECTED_HEADERS:
+                return ValidationResult(False, [{"rule": "header_check", "message": f"header mismatch: {header}"}], meta)
             for i, row in enumerate(reader, start=2):
+                if len(row) != ncols:
+                    shape_issues.append({"rule": "row_shape", "message": f"row has {len(row)} cols", "row": i})
+                    continue
+                if shape_issues:
+                    # later rules are not reported once a row has the wrong shape
+                    continue
+                bid = _strip(row[0])
                 try:
-                    bid = int(row.get('batch_id', '').strip())
-                    if bid <= 0:
-                        issues.append({"rule": self.name, "message": "batch_id not positive", "row": i})
-                except Exception:
-                    issues.append({"rule": self.name, "message": "batch_id not integer", "row": i})
-                ts = row.get('timestamp', '').strip()
-                if not TIMESTAMP_RX.match(ts):
-                    issues.append({"rule": self.name, "message": "bad timestamp format", "row": i})
-                for col in EXPECTED_HEADERS[2:]:
-                    val = row.get(col, '').strip()
-                    try:
-                        fval = float(val)
-                        if fval >= 10.0:
-                            issues.append({"rule": self.name, "message": f"{col} out of range: {fval}", "row": i})
-                    except Exception:
-                        issues.append({"rule": self.name, "message": f"{col} not float", "row": i})
-        return ValidationResult(len(issues) == 0, issues, {})
-
-class DuplicateBatchValidator(BaseValidator):
-    name = "duplicate_batch_id"
-    def validate(self, filename, path, context=None):
-        seen = set()
-        issues = []
-        with open(path, newline='') as f:
-            reader = csv.DictReader(f)
-            for i, row in enumerate(reader, start=2):
-                bid = row.get('batch_id', '').strip()
+                    if _int(bid) <= 0:
+                        add_domain((i, 0, {"rule": "value_domain", "message": "batch_id not positive", "row": i}))
+                except ValueError:
+                    add_domain((i, 0, {"rule": "value_domain", "message": "batch_id not integer", "row": i}))
+                # HH:MM:SS, two decimal digits per field (same as ^\d{2}:\d{2}:\d{2}$)
+                ts = _strip(row[1])
+                if not (len(ts) == 8 and ts[2] == ts[5] == ':'
+                        and ts[:2].isdecimal() and ts[3:5].isdecimal() and ts[6:].isdecimal()):
+                    add_domain((i, 1, {"rule": "value_domain", "message": "bad timestamp format", "row": i}))
+                try:
+                    add_values(map(_float, row[2:]))
+                except ValueError:
+                    del values[(i - 2) * ncols_r:]
+                    for j, val in enumerate(row[2:]):
+                        try:
+                            values.append(_float(val))
+                        except ValueError:
+                            values.append(nan)
+                            add_domain((i, 2 + j, {"rule": "value_domain", "message": f"{READING_COLS[j]} not float", "row": i}))
                 if bid in seen:
-                    issues.append({"rule": self.name, "message": f"duplicate batch_id: {bid}", "row": i})
+                    dup_issues.append({"rule": "duplicate_batch_id", "message": f"duplicate batch_id: {bid}", "row": i})
                 else:
                     seen.add(bid)
-        return ValidationResult(len(issues) == 0, issues, {})
+        except csv.Error as e:
+            return ValidationResult(False, [{"rule": "csv_parse", "message": f"CSV parse error: {e}"}], meta)
+        if not shape_issues:
+            for r, c, fval in _out_of_range(values):
+                domain_issues.append((r + 2, 2 + c, {"rule": "value_domain", "message": f"{READING_COLS[c]} out of range: {fval}", "row": r + 2}))
+        domain_issues = [issue for _, _, issue in sorted(domain_issues, key=lambda t: t[:2])]
+        issues = shape_issues or domain_issues or dup_issues
+        return ValidationResult(not issues, issues, meta)
 
 class UniquenessValidator(BaseValidator):
     name = "file_uniqueness"
     def validate(self, filename, path, context=None):
-        sha = tracker.hash_file(path)
+        sha = (context or {}).get('sha') or tracker.hash_file(path)
         if tracker.is_seen(sha):
             return ValidationResult(False, [{"rule": self.name, "message": "duplicate file (sha256)"}], {"sha": sha})
         return ValidationResult(True, [], {"sha": sha})
@@ -224,11 +382,7 @@ class UniquenessValidator(BaseValidator):
 DEFAULT_PIPELINE = [
     FilenameValidator(),
     NonEmptyValidator(),
-    CSVParseValidator(),
-    HeaderValidator(),
-    RowShapeValidator(),
-    ValueDomainValidator(),
-    DuplicateBatchValidator(),
+    RowScanValidator(),
     UniquenessValidator(),
 ]
 
@@ -238,53 +392,95 @@ class Pipeline:
         self.dry_run = dry_run
         self.no_move = no_move
         self.archive_path = Path(archive_path) if archive_path else ARCHIVE
+        self.check_unique = any(isinstance(v, UniquenessValidator) for v in self.validators)
+        self._mkdir_cache = set()
+
+    def _move(self, path: Path, dest: Path):
+        # mkdir each date directory once per run, then a single rename per file
+        if dest not in self._mkdir_cache:
+            dest.mkdir(parents=True, exist_ok=True)
+            self._mkdir_cache.add(dest)
+        try:
+            os.replace(path, dest / path.name)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # archive on another filesystem: copy + delete
+            shutil.move(str(path), str(dest / path.name))
 
     def process_file(self, path: Path):
+        return self.finalize(*self.check_file(path))
+
+    def check_file(self, path: Path):
+        """Run the validators and log their issues. Returns (path, issues, context);
+        issues is None if a validator raised. Safe to run in a worker process."""
         filename = path.name
         context = {}
         all_issues = []
-        sha = None
         for v in self.validators:
             try:
                 res = v.validate(filename, path, context=context)
             except Exception as e:
                 logger.emit(filename, getattr(v, 'name', 'validator_error'), f"validator exception: {e}", path=path)
-                return False
+                all_issues = None
+                break
             if res.meta:
                 context.update(res.meta)
             if not res.ok:
+                sha = context.get('sha') or tracker.hash_file(path)
                 for issue in res.issues:
-                    logger.emit(filename, issue.get('rule', v.name), issue.get('message'), row=issue.get('row'), path=path, meta=context)
+                    logger.emit(filename, issue.get('rule', v.name), issue.get('message'), row=issue.get('row'), sha=sha, meta=context)
                 all_issues.extend(res.issues)
                 break
-        if all_issues:
+        # one write per file; pool workers exit without running atexit
+        logger.flush()
+        return path, all_issues, context
+
+    def finalize(self, path: Path, issues, context):
+        """Archive or reject a checked file and record it in the tracker.
+        Always runs in the parent process."""
+        filename = path.name
+        if issues is None:
+            return False
+        if not issues and self.check_unique and tracker.is_seen(context.get('sha')):
+            # an identical file earlier in the same parallel batch was accepted
+            # after this one was checked in a worker
+            issues = [{"rule": UniquenessValidator.name, "message": "duplicate file (sha256)"}]
+            logger.emit(filename, UniquenessValidator.name, issues[0]["message"], sha=context.get('sha'), meta=context)
+            logger.flush()
+        if issues:
             if not self.dry_run and not self.no_move:
-                dest = REJECTED / datetime.now().strftime('%Y/%m/%d')
-                dest.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(path), str(dest / filename))
+                self._move(path, REJECTED / datetime.now().strftime('%Y/%m/%d'))
             return False
         else:
             sha = context.get('sha') or tracker.hash_file(path)
             if not self.dry_run and not self.no_move:
                 tracker.mark_seen(filename, sha)
                 dt = context.get('dt', datetime.now())
-                dest = self.archive_path / dt.strftime('%Y/%m/%d')
-                dest.mkdir(parents=True, exist_ok=True)
-                shutil.move(str(path), str(dest / filename))
+                self._move(path, self.archive_path / dt.strftime('%Y/%m/%d'))
             return True
 
 # ----------------------------- CLI / Utilities -----------------------------
-def process_folder(path: Path, dry_run=False, verbose=False, no_move=False, archive_path=None):
+def _init_worker():
+    # fresh handles per worker; a forked sqlite connection must not be shared
+    global tracker, logger
+    tracker = Tracker()
+    logger = ErrorLogger()
+
+def process_folder(path: Path, dry_run=False, verbose=False, no_move=False, archive_path=None,
+                   n_procs=1, chunksize=1):
     p = Path(path)
     if not p.exists():
         print("Path does not exist:", p)
         sys.exit(1)
-    files = sorted([x for x in p.iterdir() if x.is_file()])
+    # DirEntry.is_file() answers from the readdir data, no stat per entry
+    with os.scandir(p) as entries:
+        files = sorted(Path(e.path) for e in entries if e.is_file())
     pipeline = Pipeline(dry_run=dry_run, no_move=no_move, archive_path=archive_path)
     stats = {"total": 0, "valid": 0, "invalid": 0}
-    for f in files:
+
+    def record(f, ok):
         stats['total'] += 1
-        ok = pipeline.process_file(f)
         if ok:
             stats['valid'] += 1
             if verbose:
@@ -293,6 +489,24 @@ def process_folder(path: Path, dry_run=False, verbose=False, no_move=False, arch
             stats['invalid'] += 1
             if verbose:
                 print(f"REJECTED: {f.name}")
+
+    # no more workers than files: each one builds a Tracker and loads the seen set
+    n_procs = min(n_procs or os.cpu_count() or 1, len(files))
+    try:
+        if n_procs > 1:
+            # workers only validate; moves and tracker writes stay in this process
+            with multiprocessing.Pool(n_procs, initializer=_init_worker) as pool:
+                # imap (not imap_unordered) so finalize sees files in sorted order, as the
+                # serial path does, and the first of two identical files is the one kept
+                for f, issues, context in pool.imap(pipeline.check_file, files, chunksize=chunksize):
+                    record(f, pipeline.finalize(f, issues, context))
+        else:
+            for f in files:
+                record(f, pipeline.process_file(f))
+    finally:
+        # single commit for the whole batch; also runs if a file blows up so
+        # already-archived files stay recorded
+        tracker.flush()
     print(json.dumps(stats, indent=2))
     # exit with 1 if invalid files found (for CI/CD)
     if stats['invalid'] > 0:
@@ -306,16 +520,28 @@ def generate_sample_valid(filename: str):
     path = SAMPLE_DIR / filename
     dt = datetime.now().strftime('%Y%m%d%H%M%S')
     fname = f"MED_DATA_{dt}.csv"
+    # nothing here needs quoting, so build the lines csv.writer would emit
+    # (\r\n terminated) and write them in one call
+    nread = len(READING_COLS)
+    lines = [",".join(EXPECTED_HEADERS)]
+    for i in range(1, 6):
+        reading = f"{(i*0.1):.3f}"
+        lines.append(f"{i},12:00:00," + ",".join([reading] * nread))
     with open(path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(EXPECTED_HEADERS)
-        for i in range(1, 6):
-            row = [i, '12:00:00'] + [f"{(i*0.1):.3f}" for _ in range(10)]
-            writer.writerow(row)
+        f.write("\r\n".join(lines) + "\r\n")
     print('sample written to', path)
     return path
 
 # ----------------------------- Entrypoint -----------------------------
+def _int_at_least(minimum):
+    # argparse names the type in its error message: "invalid integer value: 'x'"
+    def integer(value):
+        n = int(value)
+        if n < minimum:
+            raise argparse.ArgumentTypeError(f"must be >= {minimum}, got {n}")
+        return n
+    return integer
+
 def main():
     ap = argparse.ArgumentParser(description='CU Trial Data Validator - prototype')
     ap.add_argument('command', choices=['process', 'gen-sample'], help='command')
@@ -325,12 +551,15 @@ def main():
     ap.add_argument('--sample-name', default='valid.csv')
     ap.add_argument('--no-move', action='store_true', help='Do not move files (useful for testing)')
     ap.add_argument('--archive-path', default=None, help='Custom archive directory path')
+    ap.add_argument('--n-procs', type=_int_at_least(0), default=1, help='Worker processes for validation (0 = one per CPU)')
+    ap.add_argument('--chunksize', type=_int_at_least(1), default=1, help='Files handed to a worker at a time')
 
     args = ap.parse_args()
 
     if args.command == 'process':
         process_folder(Path(args.path), dry_run=args.dry_run, verbose=args.verbose,
-                       no_move=args.no_move, archive_path=args.archive_path)
+                       no_move=args.no_move, archive_path=args.archive_path,
+                       n_procs=args.n_procs, chunksize=args.chunksize)
     elif args.command == 'gen-sample':
         generate_sample_valid(args.sample_name)
 